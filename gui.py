@@ -5,56 +5,94 @@ Photo Location Sorter - GUI Module
 A tkinter-based graphical interface for sorting photos by location.
 """
 
-import queue
+import multiprocessing
+import os
 import threading
+import time
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional
 
-from sort_photos_by_location import (
-    sort_photos,
-    load_addresses,
-    HEIC_SUPPORTED,
-)
+# sort_photos_by_location is imported on first use (the HEIC check runs once
+# the window is up) rather than here, so its exifread import doesn't delay
+# the first window
+
+
+# Minimum interval between sorting progress ticks posted to the GUI (seconds)
+PROGRESS_INTERVAL = 0.05
+
+# Per-tick budget for draining the message queue, so large backlogs cannot
+# starve the Tk event loop
+QUEUE_BATCH_SIZE = 200
+QUEUE_TIME_BUDGET = 0.005
+
+# Maximum number of lines kept in the log widget
+LOG_MAX_LINES = 5000
 
 
 class GUIProgressCallback:
-    """Thread-safe callback that posts messages to the GUI queue."""
+    """Thread-safe callback that posts messages to the GUI queue.
 
-    def __init__(self, message_queue: queue.Queue, cancel_check: Callable[[], bool]):
+    Progress ticks are not queued; only the latest tick per phase is kept in
+    ``latest_progress`` and picked up by the GUI on its next poll.
+    """
+
+    def __init__(
+        self,
+        message_queue: deque,
+        latest_progress: dict,
+        cancel_event: threading.Event,
+    ):
         self.queue = message_queue
-        self._is_cancelled = cancel_check
+        self.latest = latest_progress
+        self._cancel_event = cancel_event
+        self._sorting_total = 0
+        self._last_emit = 0.0
 
     def on_geocoding_start(self, total: int) -> None:
-        self.queue.put(('geocoding_start', total))
+        self.queue.append(('geocoding_start', total))
 
     def on_geocoding_progress(self, current: int, address: str, success: bool) -> None:
-        self.queue.put(('geocoding_progress', current, address, success))
+        self.latest['geocoding'] = ('geocoding_progress', current)
+        if not success:
+            self.queue.append(('geocoding_warn', address))
 
     def on_geocoding_complete(self, successful: int, total: int) -> None:
-        self.queue.put(('geocoding_complete', successful, total))
+        self.queue.append(('geocoding_complete', successful, total))
 
     def on_scanning_start(self) -> None:
-        self.queue.put(('scanning_start',))
+        self.queue.append(('scanning_start',))
 
     def on_scanning_complete(self, count: int) -> None:
-        self.queue.put(('scanning_complete', count))
+        self.queue.append(('scanning_complete', count))
 
     def on_sorting_start(self, total: int) -> None:
-        self.queue.put(('sorting_start', total))
+        self._sorting_total = total
+        self._last_emit = 0.0
+        self.queue.append(('sorting_start', total))
 
     def on_sorting_progress(self, current: int, filename: str, destination: str) -> None:
-        self.queue.put(('sorting_progress', current, filename, destination))
+        # Throttle to PROGRESS_INTERVAL, but always deliver the final tick
+        now = time.monotonic()
+        if current != self._sorting_total and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        # filename/destination are not displayed, so they are not forwarded
+        self.latest['sorting'] = ('sorting_progress', current)
 
     def on_sorting_complete(self, stats: dict) -> None:
-        self.queue.put(('sorting_complete', stats))
+        # Sort the per-location counts here, on the worker thread, so the
+        # GUI thread only has to display them
+        locations_sorted = sorted(stats['locations'].items(), key=lambda x: -x[1])
+        self.queue.append(('sorting_complete', stats, locations_sorted))
 
     def on_log(self, message: str) -> None:
-        self.queue.put(('log', message))
+        self.queue.append(('log', message))
 
     def is_cancelled(self) -> bool:
-        return self._is_cancelled()
+        return self._cancel_event.is_set()
 
 
 class PhotoSorterGUI:
@@ -68,11 +106,37 @@ class PhotoSorterGUI:
 
         # State
         self.worker_thread: Optional[threading.Thread] = None
-        self.message_queue: queue.Queue = queue.Queue()
+        self.message_queue: deque = deque()
+        # Latest progress tick per phase, overwritten by the worker (dict
+        # item assignment is atomic, so no lock is needed)
+        self._latest_progress: dict[str, tuple] = {}
         self.is_running = False
-        self.cancel_requested = False
+        self._cancel_event = threading.Event()
         self._current_total = 0
         self._current_phase = ''
+        # Percent of the progress bar per item in the current phase
+        self._progress_scale = 0.0
+        self._last_status = "Ready"
+        self._last_progress = 0
+        # Log lines waiting to be flushed to the log widget on the next tick;
+        # anything beyond LOG_MAX_LINES would be trimmed anyway
+        self._log_pending: deque = deque(maxlen=LOG_MAX_LINES)
+        self._log_lines = 0
+
+        # Message type -> handler for messages from the worker thread
+        self._dispatch = {
+            'sorting_progress': self._on_sorting_progress,
+            'log': self._on_log,
+            'geocoding_progress': self._on_geocoding_progress,
+            'geocoding_warn': self._on_geocoding_warn,
+            'geocoding_start': self._on_geocoding_start,
+            'geocoding_complete': self._on_geocoding_complete,
+            'scanning_start': self._on_scanning_start,
+            'scanning_complete': self._on_scanning_complete,
+            'sorting_start': self._on_sorting_start,
+            'sorting_complete': self._on_sorting_complete,
+            'finished': self._on_finished,
+        }
 
         # Build UI
         self._create_widgets()
@@ -170,16 +234,15 @@ class PhotoSorterGUI:
         progress_frame.columnconfigure(0, weight=1)
         row += 1
 
-        # Status label
-        self.status_var = tk.StringVar(value="Ready")
-        ttk.Label(progress_frame, textvariable=self.status_var).grid(
-            row=0, column=0, sticky="w"
-        )
+        # Status label and progress bar are configured directly rather than
+        # through Tk variables, avoiding variable-trace round-trips per update
+        self.status_label = ttk.Label(progress_frame, text="Ready")
+        self.status_label.grid(row=0, column=0, sticky="w")
 
-        # Progress bar
-        self.progress_var = tk.DoubleVar(value=0)
+        # Progress bar with a fixed requested length, so value updates never
+        # change its geometry
         self.progress_bar = ttk.Progressbar(
-            progress_frame, variable=self.progress_var, maximum=100, mode="determinate"
+            progress_frame, maximum=100, mode="determinate", length=400
         )
         self.progress_bar.grid(row=1, column=0, sticky="ew", pady=5)
 
@@ -187,7 +250,16 @@ class PhotoSorterGUI:
         ttk.Label(main_frame, text="Log:").grid(row=row, column=0, sticky="w")
         row += 1
 
-        self.log_text = scrolledtext.ScrolledText(main_frame, height=10, state="disabled")
+        # Write-only log: no undo history. Lines keep the default wrapping,
+        # as there is no horizontal scrollbar to reach clipped text
+        self.log_text = scrolledtext.ScrolledText(
+            main_frame,
+            height=10,
+            state="disabled",
+            undo=False,
+            autoseparators=False,
+            maxundo=0,
+        )
         self.log_text.grid(row=row, column=0, columnspan=3, sticky="nsew", pady=5)
         main_frame.rowconfigure(row, weight=1)
         row += 1
@@ -206,12 +278,18 @@ class PhotoSorterGUI:
         )
         self.cancel_button.pack(side="left", padx=5)
 
-        # HEIC support indicator
+        # HEIC support indicator (filled in once the window is up)
+        self.heic_label = ttk.Label(main_frame, text="HEIC: checking...", foreground="gray")
+        self.heic_label.grid(row=row + 1, column=0, columnspan=3, sticky="e")
+        self.root.after_idle(self._check_heic_support)
+
+    def _check_heic_support(self):
+        """Import the sorter module and show whether HEIC files are supported."""
+        from sort_photos_by_location import HEIC_SUPPORTED
+
         heic_status = "HEIC: Supported" if HEIC_SUPPORTED else "HEIC: Not available"
         heic_color = "green" if HEIC_SUPPORTED else "gray"
-        ttk.Label(main_frame, text=heic_status, foreground=heic_color).grid(
-            row=row + 1, column=0, columnspan=3, sticky="e"
-        )
+        self.heic_label.configure(text=heic_status, foreground=heic_color)
 
     def _browse_images(self):
         """Open folder browser for images folder."""
@@ -236,6 +314,8 @@ class PhotoSorterGUI:
             ],
         )
         if filepath:
+            from sort_photos_by_location import load_addresses
+
             try:
                 addresses = load_addresses(filepath)
                 self.addresses_text.delete("1.0", tk.END)
@@ -249,13 +329,13 @@ class PhotoSorterGUI:
         # Validate inputs
         images_folder = self.images_folder_var.get().strip()
         output_folder = self.output_folder_var.get().strip()
-        addresses_text = self.addresses_text.get("1.0", tk.END).strip()
 
         if not images_folder:
             messagebox.showerror("Error", "Please select an images folder.")
             return
 
-        if not Path(images_folder).is_dir():
+        images_path = Path(images_folder)
+        if not images_path.is_dir():
             messagebox.showerror("Error", "Images folder does not exist.")
             return
 
@@ -263,16 +343,12 @@ class PhotoSorterGUI:
             messagebox.showerror("Error", "Please select an output folder.")
             return
 
-        if not addresses_text:
+        # Searched on the Tcl side, so the buffer is not copied into Python
+        if not self.addresses_text.search(r"\S", "1.0", tk.END, regexp=True):
             messagebox.showerror("Error", "Please enter at least one address.")
             return
 
-        # Parse addresses (one per line, skip empty lines and comments)
-        addresses = [
-            line.strip()
-            for line in addresses_text.split("\n")
-            if line.strip() and not line.strip().startswith("#")
-        ]
+        addresses = self._read_addresses()
 
         if not addresses:
             messagebox.showerror("Error", "No valid addresses found.")
@@ -280,23 +356,23 @@ class PhotoSorterGUI:
 
         # Update UI state
         self.is_running = True
-        self.cancel_requested = False
+        self._cancel_event.clear()
         self.start_button.config(state="disabled")
         self.cancel_button.config(state="normal")
-        self.progress_var.set(0)
+        self._set_progress(0)
         self._clear_log()
         self._log(f"Starting with {len(addresses)} addresses...")
 
         # Create callback
         callback = GUIProgressCallback(
-            self.message_queue, lambda: self.cancel_requested
+            self.message_queue, self._latest_progress, self._cancel_event
         )
 
         # Start worker thread
         self.worker_thread = threading.Thread(
             target=self._worker,
             args=(
-                Path(images_folder),
+                images_path,
                 addresses,
                 Path(output_folder),
                 self.max_distance_var.get(),
@@ -307,6 +383,16 @@ class PhotoSorterGUI:
         )
         self.worker_thread.start()
 
+    def _read_addresses(self) -> list:
+        """Parse addresses line by line (skip empty lines and comments)."""
+        line_count = int(self.addresses_text.index("end-1c").split(".")[0])
+        addresses = []
+        for i in range(1, line_count + 1):
+            line = self.addresses_text.get(f"{i}.0", f"{i}.end").strip()
+            if line and not line.startswith("#"):
+                addresses.append(line)
+        return addresses
+
     def _worker(
         self,
         images_folder: Path,
@@ -318,6 +404,8 @@ class PhotoSorterGUI:
     ):
         """Worker thread that runs the sorting operation."""
         try:
+            from sort_photos_by_location import sort_photos
+
             stats = sort_photos(
                 images_folder=images_folder,
                 addresses=addresses,
@@ -326,18 +414,19 @@ class PhotoSorterGUI:
                 copy_mode=copy_mode,
                 verbose=False,
                 progress_callback=callback,
+                workers=os.cpu_count() or 1,
             )
             # sorting_complete is called by sort_photos via callback
         except Exception as e:
             callback.on_log(f"ERROR: {e}")
         finally:
-            self.message_queue.put(("finished",))
+            self.message_queue.append(("finished",))
 
     def _cancel_sorting(self):
         """Request cancellation of the current operation."""
-        self.cancel_requested = True
+        self._cancel_event.set()
         self._log("Cancellation requested...")
-        self.status_var.set("Cancelling...")
+        self._set_status("Cancelling...")
 
     def _start_queue_processor(self):
         """Start the periodic queue processor."""
@@ -345,82 +434,129 @@ class PhotoSorterGUI:
 
     def _process_queue(self):
         """Process messages from the worker thread (runs on main thread)."""
-        try:
-            while True:
-                msg = self.message_queue.get_nowait()
-                self._handle_message(msg)
-        except queue.Empty:
-            pass
+        # deque.append/popleft are atomic, so no locking is needed between
+        # the worker thread (producer) and this drain loop (consumer)
+        deadline = time.monotonic() + QUEUE_TIME_BUDGET
+        processed = 0
+        while processed < QUEUE_BATCH_SIZE and time.monotonic() < deadline:
+            try:
+                msg = self.message_queue.popleft()
+            except IndexError:
+                break
+            self._handle_message(msg)
+            processed += 1
+
+        # Schedule next check; come back as soon as Tk is idle if the budget
+        # ran out before the queue was empty
+        if self.message_queue:
+            self._flush_log()
+            self.root.after_idle(self._process_queue)
+            return
 
-        # Schedule next check
-        self.root.after(100, self._process_queue)
+        if self._apply_latest_progress():
+            processed += 1
+
+        self._flush_log()
+        # Poll again right away while messages are flowing; fall back to the
+        # slow 100 ms poll once a tick finds nothing to do
+        self.root.after(0 if processed else 100, self._process_queue)
+
+    def _apply_latest_progress(self) -> bool:
+        """Apply the newest progress tick for the active phase, if any."""
+        # Ticks left over from an earlier phase are stale and dropped
+        applied = False
+        for phase in ("geocoding", "sorting"):
+            msg = self._latest_progress.pop(phase, None)
+            if msg is not None and phase == self._current_phase:
+                self._handle_message(msg)
+                applied = True
+        return applied
 
     def _handle_message(self, msg):
         """Handle a message from the worker thread."""
-        msg_type = msg[0]
-
-        if msg_type == "geocoding_start":
-            total = msg[1]
-            self.status_var.set(f"Geocoding addresses (0/{total})...")
-            self._current_total = total
-            self._current_phase = "geocoding"
-
-        elif msg_type == "geocoding_progress":
-            current, address, success = msg[1], msg[2], msg[3]
-            self.status_var.set(
-                f"Geocoding addresses ({current}/{self._current_total})..."
-            )
-            # Progress from 0-30%
-            self.progress_var.set((current / self._current_total) * 30)
-            if not success:
-                self._log(f"Warning: Could not geocode '{address}'")
-
-        elif msg_type == "geocoding_complete":
-            successful, total = msg[1], msg[2]
-            self._log(f"Geocoded {successful}/{total} addresses")
-
-        elif msg_type == "scanning_start":
-            self.status_var.set("Scanning for images...")
-            self.progress_var.set(35)
-
-        elif msg_type == "scanning_complete":
-            count = msg[1]
-            self._log(f"Found {count} images")
-            self.progress_var.set(40)
-
-        elif msg_type == "sorting_start":
-            total = msg[1]
-            self._current_total = total
-            self._current_phase = "sorting"
-            self.status_var.set(f"Sorting images (0/{total})...")
-
-        elif msg_type == "sorting_progress":
-            current = msg[1]
-            self.status_var.set(
-                f"Sorting images ({current}/{self._current_total})..."
-            )
-            # Progress from 40% to 100%
-            self.progress_var.set(40 + (current / self._current_total) * 60)
-
-        elif msg_type == "sorting_complete":
-            stats = msg[1]
-            self._show_results(stats)
-
-        elif msg_type == "log":
-            self._log(msg[1])
-
-        elif msg_type == "finished":
-            self.is_running = False
-            self.start_button.config(state="normal")
-            self.cancel_button.config(state="disabled")
-            if self.cancel_requested:
-                self.status_var.set("Cancelled")
-                self._log("Operation cancelled by user.")
-            else:
-                self.status_var.set("Complete")
-                self.progress_var.set(100)
-
-    def _show_results(self, stats: dict):
+        self._dispatch[msg[0]](msg)
+
+    def _on_geocoding_start(self, msg):
+        total = msg[1]
+        self._set_status(f"Geocoding addresses (0/{total})...")
+        self._current_total = total
+        self._current_phase = "geocoding"
+        self._progress_scale = 30.0 / max(total, 1)
+
+    def _on_geocoding_progress(self, msg):
+        current = msg[1]
+        self._set_status(f"Geocoding addresses ({current}/{self._current_total})...")
+        # Progress from 0-30%
+        self._set_progress(current * self._progress_scale)
+
+    def _on_geocoding_warn(self, msg):
+        self._log(f"Warning: Could not geocode '{msg[1]}'")
+
+    def _on_geocoding_complete(self, msg):
+        successful, total = msg[1], msg[2]
+        self._log(f"Geocoded {successful}/{total} addresses")
+
+    def _on_scanning_start(self, msg):
+        self._current_phase = "scanning"
+        self._set_status("Scanning for images...")
+        self._set_progress(35)
+
+    def _on_scanning_complete(self, msg):
+        count = msg[1]
+        self._log(f"Found {count} images")
+        self._set_progress(40)
+
+    def _on_sorting_start(self, msg):
+        total = msg[1]
+        self._current_total = total
+        self._current_phase = "sorting"
+        self._progress_scale = 60.0 / max(total, 1)
+        self._set_status(f"Sorting images (0/{total})...")
+
+    def _on_sorting_progress(self, msg):
+        current = msg[1]
+        self._set_status(f"Sorting images ({current}/{self._current_total})...")
+        # Progress from 40% to 100%
+        self._set_progress(40.0 + current * self._progress_scale)
+
+    def _on_sorting_complete(self, msg):
+        stats, locations_sorted = msg[1], msg[2]
+        # The final tick may still be pending; show it (and any queued log
+        # lines) before the modal results dialog opens
+        self._apply_latest_progress()
+        self._flush_log()
+        self._show_results(stats, locations_sorted)
+
+    def _on_log(self, msg):
+        self._log(msg[1])
+
+    def _on_finished(self, msg):
+        self._current_phase = ""
+        self._latest_progress.clear()
+        self.is_running = False
+        self.start_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        if self._cancel_event.is_set():
+            self._set_status("Cancelled")
+            self._log("Operation cancelled by user.")
+        else:
+            self._set_status("Complete")
+            self._set_progress(100)
+
+    def _set_status(self, text: str):
+        """Update the status label if the text changed."""
+        if text != self._last_status:
+            self._last_status = text
+            self.status_label.configure(text=text)
+
+    def _set_progress(self, value: float):
+        """Update the progress bar if the whole-percent value changed."""
+        percent = int(value)
+        if percent != self._last_progress:
+            self._last_progress = percent
+            self.progress_bar.configure(value=percent)
+
+    def _show_results(self, stats: dict, locations_sorted: list):
         """Display final results."""
         self._log("=" * 40)
         self._log("SORTING COMPLETE")
@@ -430,28 +566,43 @@ class PhotoSorterGUI:
         self._log(f"Images without GPS data: {stats['no_gps_images']}")
         self._log(f"Images with no matching location: {stats['no_match_images']}")
 
-        if stats["locations"]:
+        if locations_sorted:
             self._log("")
             self._log("Images per location:")
-            for location, count in sorted(
-                stats["locations"].items(), key=lambda x: -x[1]
-            ):
-                self._log(f"  {location}: {count}")
+            self._log(
+                "\n".join(f"  {location}: {count}" for location, count in locations_sorted)
+            )
 
+        self._flush_log()
         messagebox.showinfo(
             "Complete",
             f"Sorted {stats['sorted_images']} of {stats['total_images']} images.",
         )
 
     def _log(self, message: str):
-        """Append a message to the log."""
+        """Queue a message for the log; it is written on the next flush."""
+        self._log_pending.append(message)
+
+    def _flush_log(self):
+        """Write pending log messages in a single insert and trim old lines."""
+        if not self._log_pending:
+            return
+        text = "\n".join(self._log_pending) + "\n"
+        self._log_pending.clear()
         self.log_text.config(state="normal")
-        self.log_text.insert(tk.END, message + "\n")
+        self.log_text.insert(tk.END, text)
+        self._log_lines += text.count("\n")
+        if self._log_lines > LOG_MAX_LINES:
+            excess = self._log_lines - LOG_MAX_LINES
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._log_lines = LOG_MAX_LINES
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
 
     def _clear_log(self):
         """Clear the log."""
+        self._log_pending.clear()
+        self._log_lines = 0
         self.log_text.config(state="normal")
         self.log_text.delete("1.0", tk.END)
         self.log_text.config(state="disabled")
@@ -465,4 +616,5 @@ def run_gui():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     run_gui()
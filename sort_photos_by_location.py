@@ -10,48 +10,67 @@ Usage:
 """
 
 import argparse
+import importlib.util
 import json
+import logging
+import math
+import multiprocessing
 import os
 import shutil
+import sqlite3
 import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache, partial
 from pathlib import Path
-from typing import Optional, Protocol, Callable
+from typing import Iterable, Iterator, Optional, Protocol, Callable
 
-try:
-    from PIL import Image
-    from PIL.ExifTags import TAGS, GPSTAGS
-except ImportError:
-    print("Error: Pillow is required. Install with: pip install Pillow")
-    sys.exit(1)
+# Pillow, geopy and tqdm are imported where they are used, so the CLI starts
+# (and --help works) without loading them
 
+# Reads EXIF headers without going through an image decoder (optional)
 try:
-    from geopy.geocoders import Nominatim
-    from geopy.distance import geodesic
-    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+    import exifread
+    # Images without EXIF data are expected; don't warn about each one
+    logging.getLogger('exifread').setLevel(logging.ERROR)
+    EXIFREAD_AVAILABLE = True
 except ImportError:
-    print("Error: geopy is required. Install with: pip install geopy")
-    sys.exit(1)
+    EXIFREAD_AVAILABLE = False
 
-try:
-    from tqdm import tqdm
-except ImportError:
-    # Fallback if tqdm not installed
-    def tqdm(iterable, **kwargs):
-        return iterable
-
-# HEIC/HEIF support (optional)
-try:
-    from pillow_heif import register_heif_opener
-    register_heif_opener()
-    HEIC_SUPPORTED = True
-except ImportError:
-    HEIC_SUPPORTED = False
+# HEIC/HEIF support (optional); the opener is registered when Pillow is loaded
+HEIC_SUPPORTED = importlib.util.find_spec('pillow_heif') is not None
 
 
 # Supported image extensions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.heic', '.heif'}
 
+# Extensions read through Pillow (and pillow-heif) rather than exifread
+PILLOW_ONLY_EXTENSIONS = {'.heic', '.heif'}
+
+# Number of images handed to each GPS worker process at a time
+GPS_CHUNKSIZE = 32
+
+# Chunks queued per GPS worker process; bounds memory held by results that
+# are waiting for their files to be moved
+GPS_CHUNKS_IN_FLIGHT = 4
+
+# Mean Earth radius (km), used for great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+
+# Nominatim usage policy allows at most one request per second
+GEOCODE_MIN_DELAY = 1.0
+
+# Concurrent requests sent to a self-hosted Nominatim server (no rate limit)
+SELF_HOSTED_GEOCODE_WORKERS = 4
+
+# Geocoded addresses are reused across runs for this long (seconds), after
+# which they are looked up again in case the geocoding data was corrected
+GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60
+
 
 class ProgressCallback(Protocol):
     """Protocol for progress reporting during sorting operations."""
@@ -97,6 +116,15 @@ class ProgressCallback(Protocol):
         ...
 
 
+def _progress_bar(total: int, desc: str):
+    """Return a tqdm progress bar, or None if tqdm is not installed."""
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        return None
+    return tqdm(total=total, desc=desc)
+
+
 class CLIProgressCallback:
     """Default callback that uses tqdm for CLI progress display."""
 
@@ -108,7 +136,7 @@ class CLIProgressCallback:
 
     def on_geocoding_start(self, total: int) -> None:
         print("Geocoding addresses...")
-        self._geocode_pbar = tqdm(total=total, desc="Geocoding")
+        self._geocode_pbar = _progress_bar(total, "Geocoding")
 
     def on_geocoding_progress(self, current: int, address: str, success: bool) -> None:
         if self._geocode_pbar:
@@ -129,7 +157,7 @@ class CLIProgressCallback:
 
     def on_sorting_start(self, total: int) -> None:
         print("\nSorting images...")
-        self._sort_pbar = tqdm(total=total, desc="Processing")
+        self._sort_pbar = _progress_bar(total, "Processing")
 
     def on_sorting_progress(self, current: int, filename: str, destination: str) -> None:
         if self._sort_pbar:
@@ -149,7 +177,7 @@ class CLIProgressCallback:
         return self._cancelled
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GPSCoordinates:
     """Represents GPS coordinates."""
     latitude: float
@@ -159,7 +187,7 @@ class GPSCoordinates:
         return (self.latitude, self.longitude)
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """Represents a named location with coordinates."""
     name: str
@@ -167,6 +195,17 @@ class Location:
     coordinates: Optional[GPSCoordinates] = None
 
 
+_MINUTES_TO_DEGREES = 1.0 / 60.0
+_SECONDS_TO_DEGREES = 1.0 / 3600.0
+
+# Fixed EXIF tag ids (GPSInfo IFD pointer and the GPS IFD entries we read)
+_GPS_IFD = 0x8825
+_GPS_LATITUDE_REF = 1
+_GPS_LATITUDE = 2
+_GPS_LONGITUDE_REF = 3
+_GPS_LONGITUDE = 4
+
+
 def dms_to_decimal(dms_tuple, ref: str) -> float:
     """
     Convert GPS coordinates from degrees/minutes/seconds to decimal format.
@@ -179,27 +218,25 @@ def dms_to_decimal(dms_tuple, ref: str) -> float:
         Decimal representation of the coordinate
     """
     try:
-        # Handle different formats from EXIF data
-        if hasattr(dms_tuple[0], 'numerator'):
-            # IFDRational format
-            degrees = float(dms_tuple[0].numerator) / float(dms_tuple[0].denominator)
-            minutes = float(dms_tuple[1].numerator) / float(dms_tuple[1].denominator)
-            seconds = float(dms_tuple[2].numerator) / float(dms_tuple[2].denominator)
-        else:
-            # Regular tuple format
-            degrees = float(dms_tuple[0])
-            minutes = float(dms_tuple[1])
-            seconds = float(dms_tuple[2])
-
-        decimal = degrees + (minutes / 60.0) + (seconds / 3600.0)
-
-        if ref in ('S', 'W'):
-            decimal = -decimal
-
-        return decimal
+        # Pillow's IFDRational, exifread's Ratio and plain numbers all
+        # support float(), which does the rational division in one call
+        degrees = float(dms_tuple[0])
+        minutes = float(dms_tuple[1])
+        seconds = float(dms_tuple[2])
     except (TypeError, ZeroDivisionError, IndexError) as e:
         raise ValueError(f"Invalid DMS format: {dms_tuple}") from e
 
+    decimal = degrees + minutes * _MINUTES_TO_DEGREES + seconds * _SECONDS_TO_DEGREES
+
+    # IFDRational with a zero denominator converts to NaN instead of raising
+    if not math.isfinite(decimal):
+        raise ValueError(f"Invalid DMS format: {dms_tuple}")
+
+    if ref in ('S', 'W'):
+        decimal = -decimal
+
+    return decimal
+
 
 def extract_gps_from_image(image_path: Path) -> Optional[GPSCoordinates]:
     """
@@ -212,67 +249,279 @@ def extract_gps_from_image(image_path: Path) -> Optional[GPSCoordinates]:
         GPSCoordinates if found, None otherwise
     """
     try:
-        with Image.open(image_path) as img:
-            exif_data = img._getexif()
+        if EXIFREAD_AVAILABLE and image_path.suffix.lower() not in PILLOW_ONLY_EXTENSIONS:
+            return _extract_gps_with_exifread(image_path)
+        return _extract_gps_with_pillow(image_path)
 
-            if not exif_data:
-                return None
+    except Exception as e:
+        print(f"Warning: Could not read GPS from {image_path.name}: {e}")
+        return None
 
-            # Find GPS info in EXIF
-            gps_info = {}
-            for tag_id, value in exif_data.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag == 'GPSInfo':
-                    for gps_tag_id, gps_value in value.items():
-                        gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
-                        gps_info[gps_tag] = gps_value
 
-            if not gps_info:
-                return None
+def extract_gps_batch(image_paths: list[Path]) -> list[Optional[GPSCoordinates]]:
+    """Extract GPS coordinates for a chunk of images (one worker task)."""
+    return [extract_gps_from_image(path) for path in image_paths]
 
-            # Extract latitude
-            if 'GPSLatitude' not in gps_info or 'GPSLatitudeRef' not in gps_info:
-                return None
 
-            lat = dms_to_decimal(
-                gps_info['GPSLatitude'],
-                gps_info['GPSLatitudeRef']
-            )
+def extract_gps_parallel(
+    executor: ProcessPoolExecutor,
+    images: list[Path],
+    max_chunks: int
+) -> Iterator[Optional[GPSCoordinates]]:
+    """
+    Extract GPS coordinates in worker processes, yielding them in image order.
 
-            # Extract longitude
-            if 'GPSLongitude' not in gps_info or 'GPSLongitudeRef' not in gps_info:
-                return None
+    Unlike Executor.map, which submits every image up front, at most
+    max_chunks chunks are queued at a time, so extraction runs just ahead of
+    the caller instead of buffering results for the whole folder.
 
-            lon = dms_to_decimal(
-                gps_info['GPSLongitude'],
-                gps_info['GPSLongitudeRef']
-            )
+    Args:
+        executor: Process pool to run extraction in
+        images: Image paths to read
+        max_chunks: Maximum number of chunks submitted but not yet consumed
 
-            return GPSCoordinates(latitude=lat, longitude=lon)
+    Yields:
+        GPSCoordinates (or None) for each image, in order
+    """
+    pending = deque()
+    for start in range(0, len(images), GPS_CHUNKSIZE):
+        if len(pending) >= max_chunks:
+            yield from pending.popleft().result()
+        chunk = images[start:start + GPS_CHUNKSIZE]
+        pending.append(executor.submit(extract_gps_batch, chunk))
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _extract_gps_with_exifread(image_path: Path) -> Optional[GPSCoordinates]:
+    """Read GPS coordinates from the EXIF header only, using exifread."""
+    with open(image_path, 'rb') as f:
+        # GPS tags are stored in ID order, so nothing after GPSLongitude is needed
+        tags = exifread.process_file(f, details=False, stop_tag='GPSLongitude')
+
+    lat = tags.get('GPS GPSLatitude')
+    lat_ref = tags.get('GPS GPSLatitudeRef')
+    lon = tags.get('GPS GPSLongitude')
+    lon_ref = tags.get('GPS GPSLongitudeRef')
+
+    if lat is None or lat_ref is None or lon is None or lon_ref is None:
+        return None
 
-    except Exception as e:
-        print(f"Warning: Could not read GPS from {image_path.name}: {e}")
+    return GPSCoordinates(
+        latitude=dms_to_decimal(lat.values, lat_ref.printable),
+        longitude=dms_to_decimal(lon.values, lon_ref.printable)
+    )
+
+
+@cache
+def _pillow_image():
+    """Import PIL.Image on first use, registering the HEIF opener if available."""
+    from PIL import Image
+    if HEIC_SUPPORTED:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+    return Image
+
+
+def _extract_gps_with_pillow(image_path: Path) -> Optional[GPSCoordinates]:
+    """Read GPS coordinates through Pillow (needed for HEIC/HEIF)."""
+    with _pillow_image().open(image_path) as img:
+        # For PNG, getexif() decodes the whole image to look for an eXIf
+        # chunk after the pixel data; only use one found in the header
+        if img.format == 'PNG' and 'exif' not in img.info:
+            return None
+
+        # getexif() works for every format Pillow reads (unlike _getexif(),
+        # which is JPEG-only) and get_ifd() returns the GPS block directly
+        gps_info = img.getexif().get_ifd(_GPS_IFD)
+
+    lat_dms = gps_info.get(_GPS_LATITUDE)
+    lat_ref = gps_info.get(_GPS_LATITUDE_REF)
+    lon_dms = gps_info.get(_GPS_LONGITUDE)
+    lon_ref = gps_info.get(_GPS_LONGITUDE_REF)
+    if lat_dms is None or lat_ref is None or lon_dms is None or lon_ref is None:
         return None
 
+    return GPSCoordinates(
+        latitude=dms_to_decimal(lat_dms, lat_ref),
+        longitude=dms_to_decimal(lon_dms, lon_ref),
+    )
 
-def geocode_address(address: str, geocoder: Nominatim) -> Optional[GPSCoordinates]:
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for this tool."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if base:
+        return Path(base) / 'photo_sorter'
+    return Path.home() / '.cache' / 'photo_sorter'
+
+
+class GeocodeCache:
+    """
+    Persistent address -> coordinates cache stored in SQLite.
+
+    Safe to share between geocoding threads; access is serialized. If the
+    database fails after opening (locked by another run, disk full, ...),
+    a warning is printed once and the cache acts as empty from then on.
+
+    Entries are kept per namespace (the geocoding server), so results from
+    a self-hosted server and the public service are never mixed.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = GEOCODE_CACHE_TTL,
+        namespace: str = ''
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS geocode ('
+            'addr TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL, '
+            'ts INTEGER NOT NULL)'
+        )
+        # Drop expired entries so the file doesn't grow with stale addresses
+        self._conn.execute(
+            'DELETE FROM geocode WHERE ts < ?',
+            (int(time.time() - ttl_seconds),)
+        )
+        self._conn.commit()
+
+    @classmethod
+    def open_default(cls, namespace: str = '') -> Optional['GeocodeCache']:
+        """Open the cache in the default location, or None if unavailable."""
+        try:
+            return cls(default_cache_dir() / 'geocode.sqlite', namespace=namespace)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Geocoding cache unavailable: {e}")
+            return None
+
+    def _key(self, address: str) -> str:
+        key = ' '.join(address.lower().split())
+        # The public service uses bare keys, matching entries from older runs
+        if self.namespace:
+            return f'{self.namespace}|{key}'
+        return key
+
+    def _disable(self, error: sqlite3.Error) -> None:
+        """Stop using the cache after a database error (lock must be held)."""
+        if not self._disabled:
+            self._disabled = True
+            print(f"Warning: Geocoding cache unavailable, continuing without it: {error}")
+            # Release any write lock a half-finished statement left behind
+            try:
+                self._conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    def get(self, address: str) -> Optional[GPSCoordinates]:
+        """Return cached coordinates for an address, if present and fresh."""
+        with self._lock:
+            if self._disabled:
+                return None
+            try:
+                row = self._conn.execute(
+                    'SELECT lat, lon FROM geocode WHERE addr = ? AND ts >= ?',
+                    (self._key(address), int(time.time() - self.ttl_seconds))
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+        if row is None:
+            return None
+        return GPSCoordinates(latitude=row[0], longitude=row[1])
+
+    def get_many(self, addresses: list[str]) -> dict[str, GPSCoordinates]:
+        """Return fresh cached coordinates for any of the given addresses."""
+        keys = {self._key(address): address for address in addresses}
+        key_list = list(keys)
+        min_ts = int(time.time() - self.ttl_seconds)
+        found = {}
+
+        # Stay under SQLite's limit on bound parameters per statement
+        with self._lock:
+            if self._disabled:
+                return {}
+            try:
+                for start in range(0, len(key_list), 500):
+                    batch = key_list[start:start + 500]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = self._conn.execute(
+                        f'SELECT addr, lat, lon FROM geocode '
+                        f'WHERE addr IN ({placeholders}) AND ts >= ?',
+                        (*batch, min_ts)
+                    ).fetchall()
+                    for key, lat, lon in rows:
+                        found[key] = GPSCoordinates(latitude=lat, longitude=lon)
+            except sqlite3.Error as e:
+                self._disable(e)
+                return {}
+
+        return {
+            address: found[self._key(address)]
+            for address in addresses
+            if self._key(address) in found
+        }
+
+    def put(self, address: str, coords: GPSCoordinates) -> None:
+        """Store coordinates for an address."""
+        with self._lock:
+            if self._disabled:
+                return
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO geocode (addr, lat, lon, ts) VALUES (?, ?, ?, ?)',
+                    (self._key(address), coords.latitude, coords.longitude, int(time.time()))
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def geocode_address(
+    address: str,
+    geocode: Callable,
+    cache: Optional[GeocodeCache] = None,
+    check_cache: bool = True
+) -> Optional[GPSCoordinates]:
     """
     Convert an address string to GPS coordinates using geocoding.
 
     Args:
         address: The address string to geocode
-        geocoder: The geocoder instance to use
+        geocode: Geocoding function, e.g. a rate-limited Nominatim.geocode
+        cache: Optional cache consulted before, and updated after, geocoding
+        check_cache: If False, skip the cache lookup (the caller already
+            knows the address is not cached) and only store the result
 
     Returns:
         GPSCoordinates if successful, None otherwise
     """
+    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+
+    if cache is not None and check_cache:
+        coords = cache.get(address)
+        if coords is not None:
+            return coords
+
     try:
-        location = geocoder.geocode(address, timeout=10)
+        location = geocode(address, timeout=10)
         if location:
-            return GPSCoordinates(
+            coords = GPSCoordinates(
                 latitude=location.latitude,
                 longitude=location.longitude
             )
+            if cache is not None:
+                cache.put(address, coords)
+            return coords
         return None
     except (GeocoderTimedOut, GeocoderServiceError) as e:
         print(f"Warning: Geocoding failed for '{address}': {e}")
@@ -291,23 +540,25 @@ def load_addresses(addresses_input: str) -> list[str]:
     """
     # Check if it's a file path
     if os.path.isfile(addresses_input):
-        with open(addresses_input, 'r', encoding='utf-8') as f:
-            # Handle both newline-separated and JSON array formats
-            content = f.read().strip()
+        # utf-8-sig drops the byte order mark some editors add
+        with open(addresses_input, 'r', encoding='utf-8-sig') as f:
+            # Handle both newline-separated and JSON array formats; only the
+            # first non-blank line is needed to tell them apart
+            first_line = next((line for line in f if line.strip()), '')
+            f.seek(0)
 
             # Try JSON format first
-            if content.startswith('['):
+            if first_line.lstrip().startswith('['):
                 try:
-                    return json.loads(content)
+                    return json.load(f)
                 except json.JSONDecodeError:
-                    pass
+                    f.seek(0)
 
             # Fall back to line-separated format (skip empty lines and comments)
-            addresses = [
-                line.strip() for line in content.split('\n')
-                if line.strip() and not line.strip().startswith('#')
+            return [
+                address for line in f
+                if (address := line.strip()) and not address.startswith('#')
             ]
-            return addresses
     else:
         # Treat as comma-separated string
         return [addr.strip() for addr in addresses_input.split(',') if addr.strip()]
@@ -323,11 +574,135 @@ def find_images(folder_path: Path) -> list[Path]:
     Returns:
         List of paths to image files
     """
+    # Single walk of the tree; DirEntry caches file type, so no extra stat()
     images = []
-    for ext in IMAGE_EXTENSIONS:
-        images.extend(folder_path.rglob(f'*{ext}'))
-        images.extend(folder_path.rglob(f'*{ext.upper()}'))
-    return list(set(images))  # Remove duplicates
+    pending = [folder_path]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue  # Unreadable folder
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif (entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS):
+                    images.append(Path(entry.path))
+    return images
+
+
+def to_unit_vector(coords: GPSCoordinates) -> tuple[float, float, float]:
+    """
+    Convert GPS coordinates to Earth-centred (x, y, z) on the unit sphere.
+
+    Args:
+        coords: The GPS coordinates to convert
+
+    Returns:
+        Tuple of (x, y, z)
+    """
+    lat = math.radians(coords.latitude)
+    lon = math.radians(coords.longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+class LocationMatcher:
+    """
+    Finds the closest location to a point within a maximum distance.
+
+    Locations are converted to unit vectors once, so each query costs a few
+    multiplications per location. Straight-line (chord) distance between
+    unit vectors increases with great-circle distance, so the closest chord
+    is the closest location and the distance limit becomes a chord limit.
+
+    A location within the chord limit can't differ from the query by more
+    than that limit along any axis, so locations are kept sorted by z and
+    each query only scans the band of z values around it. With many
+    addresses spread out, that is a small fraction of the list.
+    """
+
+    def __init__(self, locations: list[Location], max_distance_km: float = 0.5):
+        self.locations = [loc for loc in locations if loc.coordinates is not None]
+
+        angle = min(max_distance_km / EARTH_RADIUS_KM, math.pi)
+        chord = 2.0 * math.sin(angle / 2.0)
+        self._max_chord_sq = chord * chord
+        # Small margin so rounding never drops a location right at the limit
+        self._z_band = chord + 1e-9
+
+        # (x, y, z, original index, location), sorted by z; the index keeps
+        # the earlier location on exact ties, as in an unsorted scan
+        entries = sorted(
+            ((*to_unit_vector(loc.coordinates), index, loc)
+             for index, loc in enumerate(self.locations)),
+            key=lambda entry: entry[2]
+        )
+        self._entries = entries
+        self._z_values = [entry[2] for entry in entries]
+
+    def find_closest(self, coords: GPSCoordinates) -> Optional[Location]:
+        """
+        Find the closest location to the given coordinates.
+
+        Args:
+            coords: The GPS coordinates to match
+
+        Returns:
+            The closest Location if within max_distance_km, None otherwise
+        """
+        x, y, z = to_unit_vector(coords)
+        closest_location = None
+        closest_chord_sq = float('inf')
+        closest_index = -1
+
+        start = bisect_left(self._z_values, z - self._z_band)
+        end = bisect_right(self._z_values, z + self._z_band)
+        for lx, ly, lz, index, location in self._entries[start:end]:
+            dx = x - lx
+            dy = y - ly
+            dz = z - lz
+            chord_sq = dx * dx + dy * dy + dz * dz
+            if chord_sq < closest_chord_sq or (
+                    chord_sq == closest_chord_sq and index < closest_index):
+                closest_chord_sq = chord_sq
+                closest_location = location
+                closest_index = index
+
+        if closest_location and closest_chord_sq <= self._max_chord_sq:
+            return closest_location
+
+        return None
+
+    def match_all(
+        self,
+        all_coords: Iterable[Optional[GPSCoordinates]]
+    ) -> Iterator[tuple[Optional[GPSCoordinates], Optional[Location]]]:
+        """
+        Match a stream of coordinates, each distinct point only once.
+
+        Photos taken in bursts often share identical coordinates, so results
+        are remembered per (latitude, longitude).
+
+        Args:
+            all_coords: GPS coordinates per image (None if it has no GPS data)
+
+        Yields:
+            Tuples of (coords, closest Location or None), in input order
+        """
+        find_closest = self.find_closest
+        matches: dict[tuple[float, float], Optional[Location]] = {}
+
+        for coords in all_coords:
+            if coords is None:
+                yield coords, None
+                continue
+
+            key = (coords.latitude, coords.longitude)
+            if key not in matches:
+                matches[key] = find_closest(coords)
+            yield coords, matches[key]
 
 
 def find_closest_location(
@@ -338,6 +713,9 @@ def find_closest_location(
     """
     Find the closest location to the given coordinates.
 
+    For many lookups against the same locations, build a LocationMatcher
+    once and call find_closest() instead.
+
     Args:
         coords: The GPS coordinates to match
         locations: List of locations to compare against
@@ -346,26 +724,11 @@ def find_closest_location(
     Returns:
         The closest Location if within max_distance, None otherwise
     """
-    closest_location = None
-    closest_distance = float('inf')
-
-    for location in locations:
-        if location.coordinates is None:
-            continue
-
-        distance = geodesic(
-            coords.as_tuple(),
-            location.coordinates.as_tuple()
-        ).kilometers
-
-        if distance < closest_distance:
-            closest_distance = distance
-            closest_location = location
+    return LocationMatcher(locations, max_distance_km).find_closest(coords)
 
-    if closest_location and closest_distance <= max_distance_km:
-        return closest_location
 
-    return None
+# Characters not allowed in folder names on common filesystems
+_FOLDER_NAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
 
 
 def sanitize_folder_name(name: str) -> str:
@@ -378,16 +741,132 @@ def sanitize_folder_name(name: str) -> str:
     Returns:
         A sanitized folder name
     """
-    # Replace problematic characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
+    # Replace problematic characters and truncate if too long
+    return name.translate(_FOLDER_NAME_TABLE)[:100].strip()
+
+
+class DestinationFolders:
+    """
+    Creates output folders on first use and picks non-clashing file names.
+
+    Each folder is created and listed once; after that, name conflicts are
+    resolved against the in-memory listing instead of probing the disk.
+    Names are compared case-insensitively so results are the same on
+    case-insensitive filesystems (Windows, macOS).
+    """
+
+    def __init__(self):
+        self._names: dict[Path, set[str]] = {}
+        # Next suffix to try per (folder, file name), so a name that keeps
+        # recurring doesn't re-check _1, _2, ... every time
+        self._next_suffix: dict[tuple[Path, str], int] = {}
+
+    def reserve(self, folder: Path, filename: str) -> Path:
+        """
+        Return a free path for filename in folder and mark it as used.
+
+        Conflicts get _1, _2, ... appended to the file stem.
+
+        Args:
+            folder: Destination folder (created if needed)
+            filename: Desired file name
+
+        Returns:
+            Destination file path
+        """
+        names = self._names.get(folder)
+        if names is None:
+            folder.mkdir(exist_ok=True)
+            names = {name.casefold() for name in os.listdir(folder)}
+            self._names[folder] = names
+
+        name = filename
+        if name.casefold() in names:
+            stem, suffix = os.path.splitext(filename)
+            key = (folder, filename.casefold())
+            counter = self._next_suffix.get(key, 1)
+            while name.casefold() in names:
+                name = f"{stem}_{counter}{suffix}"
+                counter += 1
+            self._next_suffix[key] = counter
+
+        names.add(name.casefold())
+        return folder / name
+
+
+def _copy_file_range(source: Path, dest: Path) -> bool:
+    """
+    Copy file contents with os.copy_file_range (Linux).
+
+    The kernel copies without passing data through user space, and shares
+    the data blocks outright (reflink) on filesystems such as Btrfs and XFS.
+
+    Returns:
+        True if the file was copied, False if copy_file_range is unavailable
+        for these files (dest may then be left empty)
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        copied = 0
+        try:
+            while remaining > 0:
+                sent = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if sent == 0:
+                    # Some filesystems (FUSE, NFS/CIFS, eCryptfs) report 0
+                    # instead of an error on kernels 5.3-5.18
+                    if copied:
+                        raise OSError(f"copy_file_range stopped early copying {source}")
+                    return False
+                copied += sent
+                remaining -= sent
+        except OSError:
+            # Unsupported (e.g. across filesystems on older kernels); nothing
+            # was written yet, so the caller can fall back to a regular copy
+            if copied:
+                raise
+            return False
+    return True
+
+
+def transfer_file(source: Path, dest: Path, copy_mode: bool) -> None:
+    """
+    Copy or move a file to its destination path.
+
+    Moves within one filesystem are a single rename; moves across
+    filesystems fall back to shutil.move (copy, then delete). Copies use
+    copy_file_range where available, so they can be reflinks.
+
+    Args:
+        source: Path of the file to transfer
+        dest: Destination file path
+        copy_mode: If True, copy the file; if False, move it
+    """
+    if copy_mode:
+        if not _copy_file_range(source, dest):
+            shutil.copyfile(source, dest)
+        shutil.copystat(source, dest)
+        return
+
+    try:
+        os.replace(source, dest)
+    except OSError:
+        shutil.move(source, dest)
+
 
-    # Truncate if too long
-    if len(name) > 100:
-        name = name[:100]
+def _worker_context():
+    """
+    Return a multiprocessing context that never forks the calling process.
 
-    return name.strip()
+    sort_photos may run on a background thread (the GUI does this), and
+    forking a multi-threaded process can deadlock the children on locks
+    held by other threads at fork time.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
 
 
 def sort_photos(
@@ -397,7 +876,10 @@ def sort_photos(
     max_distance_km: float = 0.5,
     copy_mode: bool = False,
     verbose: bool = False,
-    progress_callback: Optional[ProgressCallback] = None
+    progress_callback: Optional[ProgressCallback] = None,
+    workers: int = 1,
+    geocode_workers: int = 1,
+    geocoder_domain: Optional[str] = None
 ) -> dict:
     """
     Sort photos into folders based on their proximity to known addresses.
@@ -410,6 +892,13 @@ def sort_photos(
         copy_mode: If True, copy files; if False, move files
         verbose: If True, print detailed progress
         progress_callback: Optional callback for progress reporting
+        workers: Number of processes used to read GPS data from images
+        geocode_workers: Number of concurrent geocoding requests; only used
+            with geocoder_domain, as the public service is queried serially
+        geocoder_domain: Self-hosted Nominatim server to use instead of the
+            public one, e.g. "localhost:8080" or "https://nominatim.lan"
+            (plain HTTP unless a scheme is given); requests to it are not
+            rate-limited
 
     Returns:
         Dictionary with statistics about the sorting operation
@@ -423,28 +912,83 @@ def sort_photos(
         'sorted_images': 0,
         'no_gps_images': 0,
         'no_match_images': 0,
-        'locations': {}
+        'locations': Counter()
     }
 
-    # Initialize geocoder
-    geocoder = Nominatim(user_agent="photo_location_sorter")
+    from geopy.geocoders import Nominatim
+    from geopy.extra.rate_limiter import RateLimiter
+
+    # Initialize geocoder; one instance keeps its HTTP session for all
+    # requests, and the rate limiter spaces them out and retries failures
+    if geocoder_domain:
+        # Self-hosted Nominatim serves plain HTTP by default
+        scheme, _, domain = geocoder_domain.rpartition('://')
+        scheme = scheme.lower() or 'http'
+        domain = domain.rstrip('/')
+        geocoder = Nominatim(
+            user_agent="photo_location_sorter",
+            domain=domain,
+            scheme=scheme
+        )
+        cache_namespace = f'{scheme}://{domain.lower()}'
+        min_delay = 0.0
+    else:
+        geocoder = Nominatim(user_agent="photo_location_sorter")
+        cache_namespace = ''
+        min_delay = GEOCODE_MIN_DELAY
+        # The public service allows one request at a time per client
+        geocode_workers = 1
+    geocode = RateLimiter(
+        geocoder.geocode,
+        min_delay_seconds=min_delay,
+        max_retries=2,
+        swallow_exceptions=False
+    )
 
     # Geocode all addresses
     locations: list[Location] = []
     progress_callback.on_geocoding_start(len(addresses))
 
-    for i, address in enumerate(addresses):
-        if progress_callback.is_cancelled():
-            return stats
+    cache = GeocodeCache.open_default(cache_namespace)
 
-        coords = geocode_address(address, geocoder)
-        location = Location(
-            name=sanitize_folder_name(address),
-            address=address,
-            coordinates=coords
-        )
-        locations.append(location)
-        progress_callback.on_geocoding_progress(i + 1, address, coords is not None)
+    # Addresses geocoded in earlier runs are resolved with a single cache
+    # query, so a repeated run never touches the geocoder; the rest are known
+    # misses and go straight to the geocoder
+    known = cache.get_many(addresses) if cache is not None else {}
+    pending = [address for address in addresses if address not in known]
+
+    lookup = partial(geocode_address, geocode=geocode, cache=cache, check_cache=False)
+
+    # Geocoding is network-bound, so concurrent requests (self-hosted
+    # servers only) use threads
+    geocode_executor = (
+        ThreadPoolExecutor(max_workers=geocode_workers)
+        if geocode_workers > 1 and pending else None
+    )
+    if geocode_executor is not None:
+        pending_coords = geocode_executor.map(lookup, pending)
+    else:
+        pending_coords = map(lookup, pending)
+
+    try:
+        for i, address in enumerate(addresses):
+            if progress_callback.is_cancelled():
+                return stats
+
+            coords = known[address] if address in known else next(pending_coords)
+
+            location = Location(
+                name=sanitize_folder_name(address),
+                address=address,
+                coordinates=coords
+            )
+            locations.append(location)
+            progress_callback.on_geocoding_progress(i + 1, address, coords is not None)
+    finally:
+        if geocode_executor is not None:
+            geocode_executor.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.close()
 
     # Filter locations with valid coordinates
     valid_locations = [loc for loc in locations if loc.coordinates is not None]
@@ -454,6 +998,8 @@ def sort_photos(
         progress_callback.on_log("Error: No addresses could be geocoded.")
         return stats
 
+    matcher = LocationMatcher(valid_locations, max_distance_km)
+
     # Find all images
     progress_callback.on_scanning_start()
     images = find_images(images_folder)
@@ -471,72 +1017,62 @@ def sort_photos(
     unknown_folder = output_folder / "_unknown_location"
     no_gps_folder = output_folder / "_no_gps_data"
 
+    # Folder paths per location are built once; folders are created on first use
+    location_folders = {loc.name: output_folder / loc.name for loc in valid_locations}
+    destinations = DestinationFolders()
+
     # Process each image
     progress_callback.on_sorting_start(len(images))
 
-    for i, image_path in enumerate(images):
-        if progress_callback.is_cancelled():
-            return stats
-
-        # Extract GPS coordinates
-        coords = extract_gps_from_image(image_path)
-
-        if coords is None:
-            stats['no_gps_images'] += 1
-            # Move to no GPS folder
-            no_gps_folder.mkdir(exist_ok=True)
-            dest = no_gps_folder / image_path.name
-            if copy_mode:
-                shutil.copy2(image_path, dest)
-            else:
-                shutil.move(str(image_path), dest)
-
-            progress_callback.on_sorting_progress(i + 1, image_path.name, "_no_gps_data")
-            continue
-
-        # Find closest location
-        closest = find_closest_location(coords, valid_locations, max_distance_km)
-
-        if closest is None:
-            stats['no_match_images'] += 1
-            # Move to unknown folder
-            unknown_folder.mkdir(exist_ok=True)
-            dest = unknown_folder / image_path.name
-            if copy_mode:
-                shutil.copy2(image_path, dest)
-            else:
-                shutil.move(str(image_path), dest)
-
-            progress_callback.on_sorting_progress(i + 1, image_path.name, "_unknown_location")
-            continue
-
-        # Create location folder and move image
-        location_folder = output_folder / closest.name
-        location_folder.mkdir(exist_ok=True)
-
-        dest = location_folder / image_path.name
-
-        # Handle filename conflicts
-        counter = 1
-        while dest.exists():
-            stem = image_path.stem
-            suffix = image_path.suffix
-            dest = location_folder / f"{stem}_{counter}{suffix}"
-            counter += 1
-
-        if copy_mode:
-            shutil.copy2(image_path, dest)
-        else:
-            shutil.move(str(image_path), dest)
-
-        stats['sorted_images'] += 1
-
-        # Track per-location stats
-        if closest.name not in stats['locations']:
-            stats['locations'][closest.name] = 0
-        stats['locations'][closest.name] += 1
-
-        progress_callback.on_sorting_progress(i + 1, image_path.name, closest.name)
+    # GPS extraction is CPU-bound, so it can be spread over worker processes.
+    # Results come back in order and files are still moved one at a time
+    # here, which avoids races on destination filenames.
+    executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+        if workers > 1 else None
+    )
+    if executor is not None:
+        all_coords = extract_gps_parallel(executor, images, workers * GPS_CHUNKS_IN_FLIGHT)
+    else:
+        all_coords = map(extract_gps_from_image, images)
+
+    try:
+        all_matches = matcher.match_all(all_coords)
+        for i, (image_path, (coords, closest)) in enumerate(zip(images, all_matches)):
+            if progress_callback.is_cancelled():
+                return stats
+
+            if coords is None:
+                stats['no_gps_images'] += 1
+                # Move to no GPS folder
+                dest = destinations.reserve(no_gps_folder, image_path.name)
+                transfer_file(image_path, dest, copy_mode)
+
+                progress_callback.on_sorting_progress(i + 1, image_path.name, "_no_gps_data")
+                continue
+
+            if closest is None:
+                stats['no_match_images'] += 1
+                # Move to unknown folder
+                dest = destinations.reserve(unknown_folder, image_path.name)
+                transfer_file(image_path, dest, copy_mode)
+
+                progress_callback.on_sorting_progress(i + 1, image_path.name, "_unknown_location")
+                continue
+
+            # Move image to its location folder
+            dest = destinations.reserve(location_folders[closest.name], image_path.name)
+            transfer_file(image_path, dest, copy_mode)
+
+            stats['sorted_images'] += 1
+
+            # Track per-location stats
+            stats['locations'][closest.name] += 1
+
+            progress_callback.on_sorting_progress(i + 1, image_path.name, closest.name)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
     progress_callback.on_sorting_complete(stats)
     return stats
@@ -554,10 +1090,18 @@ def print_stats(stats: dict):
 
     if stats['locations']:
         print("\nImages per location:")
-        for location, count in sorted(stats['locations'].items(), key=lambda x: -x[1]):
+        for location, count in stats['locations'].most_common():
             print(f"  {location}: {count}")
 
 
+def check_dependencies() -> None:
+    """Exit with an install hint if a required package is missing."""
+    for module, package in (('PIL', 'Pillow'), ('geopy', 'geopy')):
+        if importlib.util.find_spec(module) is None:
+            print(f"Error: {package} is required. Install with: pip install {package}")
+            sys.exit(1)
+
+
 def main():
     # Launch GUI if no arguments provided
     if len(sys.argv) == 1:
@@ -623,6 +1167,23 @@ Examples:
         help='Copy files instead of moving them'
     )
 
+    parser.add_argument(
+        '-j', '--workers', '--max-concurrency',
+        dest='workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of processes used to read GPS data from images '
+             '(default: number of CPUs)'
+    )
+
+    parser.add_argument(
+        '--geocoder-domain',
+        help='Self-hosted Nominatim server to geocode with instead of the public '
+             'service, e.g. localhost:8080 (plain HTTP unless a scheme such as '
+             'https:// is given; requests are sent '
+             f'{SELF_HOSTED_GEOCODE_WORKERS} at a time, without rate limiting)'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -630,6 +1191,7 @@ Examples:
     )
 
     args = parser.parse_args()
+    check_dependencies()
 
     # Validate inputs
     images_folder = Path(args.images)
@@ -658,11 +1220,16 @@ Examples:
         output_folder=output_folder,
         max_distance_km=args.max_distance,
         copy_mode=args.copy,
-        verbose=args.verbose
+        verbose=args.verbose,
+        workers=max(args.workers, 1),
+        geocode_workers=SELF_HOSTED_GEOCODE_WORKERS,
+        geocoder_domain=args.geocoder_domain
     )
 
     print_stats(stats)
 
 
 if __name__ == '__main__':
+    # Required for worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()